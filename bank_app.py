@@ -11,159 +11,334 @@ from contextlib import contextmanager
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 import secrets
 import os
-import csv
+import codecs
+import threading
 from datetime import datetime
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "bank.db")
 
+# ---------- SQL ----------
+# Kept as module constants so every call passes the identical string and
+# hits the connection's prepared-statement cache.
+
+SQL_SELECT_ACCT = "SELECT account_no, name, balance_paise, opened_at FROM accounts WHERE account_no = ?"
+
+SQL_ACCT_EXISTS = "SELECT 1 FROM accounts WHERE account_no = ?"
+
+SQL_INSERT_ACCT = "INSERT OR IGNORE INTO accounts(account_no, name) VALUES (?, ?)"
+
+# The upper bound stops SQLite from overflowing the sum into a REAL
+SQL_CREDIT_BAL = """
+    UPDATE accounts SET balance_paise = balance_paise + ?
+    WHERE account_no = ? AND balance_paise <= 9223372036854775807 - ?
+    RETURNING balance_paise
+"""
+
+SQL_DEBIT_BAL = """
+    UPDATE accounts SET balance_paise = balance_paise - ?
+    WHERE account_no = ? AND balance_paise >= ?
+    RETURNING balance_paise
+"""
+
+SQL_INSERT_TX = """
+    INSERT INTO transactions(account_no, type, amount_paise, balance_after_paise, counterparty_account, note)
+    VALUES(?, ?, ?, ?, ?, ?)
+"""
+
+SQL_FETCH_TX = """
+    SELECT id, type, amount_paise, balance_after_paise, counterparty_account, note, created_at
+    FROM transactions
+    WHERE account_no = ?
+    ORDER BY id DESC
+    LIMIT ?
+"""
+
+SQL_EXPORT_TX = """
+    SELECT id, type, amount_paise, balance_after_paise, counterparty_account, note, created_at
+    FROM transactions
+    WHERE account_no = ?
+    ORDER BY id DESC
+"""
+
+_CONN = None  # shared connection, opened lazily on first use
+_TX_CUR = None  # cursor on _CONN reserved for ledger inserts
+_CONN_LOCK = threading.RLock()  # one caller at a time on the shared connection
+
+def _connect():
+    # check_same_thread is off because access is serialized by _CONN_LOCK in db_conn()
+    conn = sqlite3.connect(DB_PATH, isolation_level=None,  # autocommit mode; we'll use explicit BEGIN
+                           check_same_thread=False, cached_statements=256)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute("PRAGMA synchronous = NORMAL;")  # safe with WAL; one fewer fsync per commit
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    conn.execute("PRAGMA cache_size = -8000;")  # ~8 MB page cache
+    conn.execute("PRAGMA mmap_size = 268435456;")
+    return conn
+
 @contextmanager
 def db_conn():
-    conn = sqlite3.connect(DB_PATH, isolation_level=None)  # autocommit mode; we'll use explicit BEGIN
+    """
+    Yield the process-wide connection, opening it on first use.
+    The connection lock is held for the whole block, so each transaction
+    runs alone even when callers are on different threads.
+    """
+    global _CONN, _TX_CUR
+    with _CONN_LOCK:
+        if _CONN is None:
+            _CONN = _connect()
+            _TX_CUR = _CONN.cursor()
+        conn = _CONN
+        outer_tx = conn.in_transaction
+        try:
+            yield conn
+        finally:
+            # A BaseException (e.g. KeyboardInterrupt) skips the callers'
+            # ROLLBACK; don't leave the shared connection mid-transaction
+            if not outer_tx and conn.in_transaction:
+                conn.execute("ROLLBACK;")
+
+def _create_schema(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS accounts (
+        account_no INTEGER PRIMARY KEY,  -- 12-digit number, zero-padded for display
+        name       TEXT NOT NULL,
+        balance_paise INTEGER NOT NULL DEFAULT 0 CHECK(typeof(balance_paise) = 'integer'),
+        opened_at  TEXT NOT NULL DEFAULT (datetime('now','localtime'))
+    );
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        account_no INTEGER NOT NULL,
+        type TEXT NOT NULL CHECK(type IN ('DEPOSIT','WITHDRAW','TRANSFER_IN','TRANSFER_OUT')),
+        amount_paise INTEGER NOT NULL,
+        balance_after_paise INTEGER NOT NULL,
+        counterparty_account INTEGER,
+        note TEXT,
+        created_at TEXT NOT NULL DEFAULT (datetime('now','localtime')),
+        FOREIGN KEY(account_no) REFERENCES accounts(account_no)
+    );
+    """)
+    # History lookups filter by account and walk newest-first
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_tx_account_id ON transactions(account_no, id DESC);")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_tx_account_created ON transactions(account_no, created_at);")
+
+def _migrate_text_account_no(conn):
+    """Rebuild databases created when account numbers were stored as TEXT."""
+    cols = {r[1]: r[2] for r in conn.execute("PRAGMA table_info(accounts)")}
+    if cols.get("account_no", "").upper() != "TEXT":
+        return
+    conn.execute("PRAGMA foreign_keys = OFF;")  # cannot be changed inside a transaction
     try:
-        conn.execute("PRAGMA foreign_keys = ON;")
-        yield conn
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            conn.execute("ALTER TABLE transactions RENAME TO transactions_old;")
+            conn.execute("ALTER TABLE accounts RENAME TO accounts_old;")
+            conn.execute("DROP INDEX IF EXISTS ix_tx_account_id;")
+            conn.execute("DROP INDEX IF EXISTS ix_tx_account_created;")
+            _create_schema(conn)
+            conn.execute("""
+                INSERT INTO accounts(account_no, name, balance_paise, opened_at)
+                SELECT CAST(account_no AS INTEGER), name, balance_paise, opened_at FROM accounts_old
+            """)
+            conn.execute("""
+                INSERT INTO transactions(id, account_no, type, amount_paise, balance_after_paise,
+                                         counterparty_account, note, created_at)
+                SELECT id, CAST(account_no AS INTEGER), type, amount_paise, balance_after_paise,
+                       CAST(counterparty_account AS INTEGER), note, created_at
+                FROM transactions_old
+            """)
+            conn.execute("DROP TABLE transactions_old;")
+            conn.execute("DROP TABLE accounts_old;")
+            conn.execute("COMMIT;")
+        except Exception:
+            conn.execute("ROLLBACK;")
+            raise
     finally:
-        conn.close()
+        conn.execute("PRAGMA foreign_keys = ON;")
 
 def init_db():
     with db_conn() as conn:
-        conn.execute("""
-        CREATE TABLE IF NOT EXISTS accounts (
-            account_no TEXT PRIMARY KEY,
-            name       TEXT NOT NULL,
-            balance_paise INTEGER NOT NULL DEFAULT 0,
-            opened_at  TEXT NOT NULL DEFAULT (datetime('now','localtime'))
-        );
-        """)
-        conn.execute("""
-        CREATE TABLE IF NOT EXISTS transactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            account_no TEXT NOT NULL,
-            type TEXT NOT NULL CHECK(type IN ('DEPOSIT','WITHDRAW','TRANSFER_IN','TRANSFER_OUT')),
-            amount_paise INTEGER NOT NULL,
-            balance_after_paise INTEGER NOT NULL,
-            counterparty_account TEXT,
-            note TEXT,
-            created_at TEXT NOT NULL DEFAULT (datetime('now','localtime')),
-            FOREIGN KEY(account_no) REFERENCES accounts(account_no)
-        );
-        """)
+        conn.execute("PRAGMA journal_mode = WAL;")  # persistent; readers no longer block writers
+        _migrate_text_account_no(conn)
+        _create_schema(conn)
+        # Collect planner statistics until there are some; ANALYZE on empty
+        # tables leaves sqlite_stat1 empty, so re-check on every start
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is not None
+        if not has_stats or conn.execute("SELECT 1 FROM sqlite_stat1 LIMIT 1").fetchone() is None:
+            conn.execute("ANALYZE;")
+
+def checkpoint_db():
+    """Fold the WAL back into the main database file and truncate it."""
+    with db_conn() as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+
+def close_db():
+    """Refresh planner stats, checkpoint and close the shared connection, if one is open."""
+    global _CONN, _TX_CUR
+    with _CONN_LOCK:
+        if _CONN is None:
+            return
+        try:
+            if _CONN.in_transaction:
+                _CONN.execute("ROLLBACK;")
+            _CONN.execute("PRAGMA optimize;")
+            checkpoint_db()
+        finally:
+            _TX_CUR.close()
+            _CONN.close()
+            _CONN = _TX_CUR = None
 
 # ---------- Money helpers ----------
 
+_QUANT = Decimal("0.01")
+_HUNDRED = Decimal(100)
+_MAX_PAISE = 2**63 - 1  # largest value SQLite can store as INTEGER
+_INVALID_AMOUNT = "Invalid amount. Please enter a valid number like 100 or 100.50"
+
 def parse_amount_to_paise(s: str) -> int:
     """Parse a human input like '123.45' into integer paise (e.g., 12345)."""
     s = s.strip().replace(",", "")
     if s.startswith("₹"):
         s = s[1:].strip()
-    try:
-        d = (Decimal(s)
-             .quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
-    except (InvalidOperation, ValueError):
-        raise ValueError("Invalid amount. Please enter a valid number like 100 or 100.50")
-    if d <= 0:
+    int_part, _, frac = s.partition(".")
+    if (int_part or frac) and s.isascii() and (not int_part or int_part.isdigit()) \
+            and (not frac or frac.isdigit()):
+        # Plain decimal: integer arithmetic, rounding half-up on the third fractional digit.
+        # _MAX_PAISE is 19 digits, so more than 17 rupee digits can never fit.
+        if len(int_part.lstrip("0")) > 17:
+            raise ValueError(_INVALID_AMOUNT)
+        paise = int(int_part or "0") * 100 + int((frac + "00")[:2])
+        if len(frac) > 2 and frac[2] >= "5":
+            paise += 1
+    else:
+        # Anything else (sign, exponent, ...) goes through Decimal
+        try:
+            d = Decimal(s).quantize(_QUANT, rounding=ROUND_HALF_UP)
+            if not d.is_finite():
+                raise ValueError
+        except (InvalidOperation, ValueError):
+            raise ValueError(_INVALID_AMOUNT)
+        paise = int((d * _HUNDRED).to_integral_value(rounding=ROUND_HALF_UP))
+    if paise > _MAX_PAISE:
+        raise ValueError(_INVALID_AMOUNT)
+    if paise <= 0:
         raise ValueError("Amount must be positive.")
-    paise = int((d * 100).to_integral_value(rounding=ROUND_HALF_UP))
     return paise
 
 def paise_to_rupees(paise: int) -> str:
-    rupees = Decimal(paise) / Decimal(100)
-    return f"₹{rupees:.2f}"
+    rupees, rem = divmod(abs(paise), 100)
+    sign = "-" if paise < 0 else ""
+    return f"₹{sign}{rupees}.{rem:02d}"
 
 # ---------- Core operations ----------
 
 class InsufficientFunds(Exception):
     pass
 
-def generate_account_no() -> str:
+def generate_account_no() -> int:
     # 12-digit pseudo-random number (not real banking format)
-    return "".join(str(secrets.randbelow(10)) for _ in range(12))
+    return secrets.randbelow(10**12)
 
-def create_account(name: str) -> str:
+def parse_account_no(s: str) -> int:
+    """Parse a user-entered account number like '004213377001' into its integer key."""
+    s = s.strip()
+    if not (s.isascii() and s.isdigit() and len(s) <= 12):
+        raise ValueError("Invalid account number. Please enter up to 12 digits.")
+    return int(s)
+
+def format_account_no(account_no: int) -> str:
+    return f"{account_no:012d}"
+
+def create_account(name: str) -> int:
     name = name.strip()
     if not name:
         raise ValueError("Name cannot be empty.")
     with db_conn() as conn:
         while True:
             acct = generate_account_no()
-            cur = conn.execute("SELECT 1 FROM accounts WHERE account_no = ?", (acct,))
-            if cur.fetchone() is None:
+            # The primary key rejects collisions; retry with a fresh number
+            cur = conn.execute(SQL_INSERT_ACCT, (acct, name))
+            if cur.rowcount == 1:
                 break
-        conn.execute("INSERT INTO accounts(account_no, name) VALUES (?, ?)", (acct, name))
     return acct
 
-def get_account(conn, account_no: str):
-    cur = conn.execute("SELECT account_no, name, balance_paise, opened_at FROM accounts WHERE account_no = ?", (account_no,))
+def account_exists(conn, account_no: int) -> bool:
+    return conn.execute(SQL_ACCT_EXISTS, (account_no,)).fetchone() is not None
+
+def get_account(conn, account_no: int):
+    cur = conn.execute(SQL_SELECT_ACCT, (account_no,))
     return cur.fetchone()
 
-def deposit(account_no: str, amount_paise: int, note: str | None = None):
+def deposit(account_no: int, amount_paise: int, note: str | None = None):
     with db_conn() as conn:
         conn.execute("BEGIN IMMEDIATE;")
         try:
-            acc = get_account(conn, account_no)
-            if not acc:
-                raise ValueError("Account not found.")
-            new_bal = acc[2] + amount_paise
-            conn.execute("UPDATE accounts SET balance_paise = ? WHERE account_no = ?", (new_bal, account_no))
-            conn.execute("""
-                INSERT INTO transactions(account_no, type, amount_paise, balance_after_paise, note)
-                VALUES(?, 'DEPOSIT', ?, ?, ?)
-            """, (account_no, amount_paise, new_bal, note))
+            row = conn.execute(SQL_CREDIT_BAL, (amount_paise, account_no, amount_paise)).fetchone()
+            if row is None:
+                if not account_exists(conn, account_no):
+                    raise ValueError("Account not found.")
+                raise ValueError("Deposit would overflow the account balance.")
+            new_bal = row[0]
+            _TX_CUR.execute(SQL_INSERT_TX, (account_no, "DEPOSIT", amount_paise, new_bal, None, note))
             conn.execute("COMMIT;")
             return new_bal
         except Exception:
             conn.execute("ROLLBACK;")
             raise
 
-def withdraw(account_no: str, amount_paise: int, note: str | None = None):
+def withdraw(account_no: int, amount_paise: int, note: str | None = None):
     with db_conn() as conn:
         conn.execute("BEGIN IMMEDIATE;")
         try:
-            acc = get_account(conn, account_no)
-            if not acc:
-                raise ValueError("Account not found.")
-            if acc[2] < amount_paise:
+            row = conn.execute(SQL_DEBIT_BAL, (amount_paise, account_no, amount_paise)).fetchone()
+            if row is None:
+                # Either no such account or the guard rejected it
+                if not account_exists(conn, account_no):
+                    raise ValueError("Account not found.")
                 raise InsufficientFunds("Insufficient balance.")
-            new_bal = acc[2] - amount_paise
-            conn.execute("UPDATE accounts SET balance_paise = ? WHERE account_no = ?", (new_bal, account_no))
-            conn.execute("""
-                INSERT INTO transactions(account_no, type, amount_paise, balance_after_paise, note)
-                VALUES(?, 'WITHDRAW', ?, ?, ?)
-            """, (account_no, amount_paise, new_bal, note))
+            new_bal = row[0]
+            _TX_CUR.execute(SQL_INSERT_TX, (account_no, "WITHDRAW", amount_paise, new_bal, None, note))
             conn.execute("COMMIT;")
             return new_bal
         except Exception:
             conn.execute("ROLLBACK;")
             raise
 
-def transfer(from_acct: str, to_acct: str, amount_paise: int, note: str | None = None):
+def transfer(from_acct: int, to_acct: int, amount_paise: int, note: str | None = None):
     if from_acct == to_acct:
         raise ValueError("Cannot transfer to the same account.")
     with db_conn() as conn:
         conn.execute("BEGIN IMMEDIATE;")
         try:
-            a = get_account(conn, from_acct)
-            b = get_account(conn, to_acct)
-            if not a or not b:
-                raise ValueError("One or both accounts not found.")
-            if a[2] < amount_paise:
-                raise InsufficientFunds("Insufficient balance for transfer.")
-
-            new_a = a[2] - amount_paise
-            new_b = b[2] + amount_paise
+            # Touch both rows in account-number order so concurrent
+            # transfers always take them in the same order
+            new = {}
+            for acct in sorted((from_acct, to_acct)):
+                if acct == from_acct:
+                    row = conn.execute(SQL_DEBIT_BAL, (amount_paise, from_acct, amount_paise)).fetchone()
+                    if row is None:
+                        # A missing account takes priority regardless of which leg runs first
+                        if not account_exists(conn, from_acct) or not account_exists(conn, to_acct):
+                            raise ValueError("One or both accounts not found.")
+                        raise InsufficientFunds("Insufficient balance for transfer.")
+                else:
+                    row = conn.execute(SQL_CREDIT_BAL, (amount_paise, to_acct, amount_paise)).fetchone()
+                    if row is None:
+                        if not account_exists(conn, to_acct):
+                            raise ValueError("One or both accounts not found.")
+                        raise ValueError("Transfer would overflow the recipient's balance.")
+                new[acct] = row[0]
 
-            conn.execute("UPDATE accounts SET balance_paise = ? WHERE account_no = ?", (new_a, from_acct))
-            conn.execute("UPDATE accounts SET balance_paise = ? WHERE account_no = ?", (new_b, to_acct))
+            new_a = new[from_acct]
+            new_b = new[to_acct]
 
             # Log both sides of the transfer
-            conn.execute("""
-                INSERT INTO transactions(account_no, type, amount_paise, balance_after_paise, counterparty_account, note)
-                VALUES(?, 'TRANSFER_OUT', ?, ?, ?, ?)
-            """, (from_acct, amount_paise, new_a, to_acct, note))
-            conn.execute("""
-                INSERT INTO transactions(account_no, type, amount_paise, balance_after_paise, counterparty_account, note)
-                VALUES(?, 'TRANSFER_IN',  ?, ?, ?, ?)
-            """, (to_acct, amount_paise, new_b, from_acct, note))
+            _TX_CUR.executemany(SQL_INSERT_TX, [
+                (from_acct, "TRANSFER_OUT", amount_paise, new_a, to_acct, note),
+                (to_acct, "TRANSFER_IN", amount_paise, new_b, from_acct, note),
+            ])
 
             conn.execute("COMMIT;")
             return new_a, new_b
@@ -171,47 +346,72 @@ def transfer(from_acct: str, to_acct: str, amount_paise: int, note: str | None =
             conn.execute("ROLLBACK;")
             raise
 
-def fetch_transactions(account_no: str, limit: int = 20):
+def apply_batch(ops):
+    """
+    Apply many deposits/withdrawals atomically in one write transaction.
+    ops: iterable of (type, account_no, amount_paise, note) with type
+    'DEPOSIT' or 'WITHDRAW'. Returns the new balance after each op.
+    """
     with db_conn() as conn:
-        cur = conn.execute("""
-            SELECT id, type, amount_paise, balance_after_paise, counterparty_account, note, created_at
-            FROM transactions
-            WHERE account_no = ?
-            ORDER BY id DESC
-            LIMIT ?
-        """, (account_no, limit))
-        return cur.fetchall()
-
-from datetime import datetime
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            tx_rows = []
+            for t_type, account_no, amount_paise, note in ops:
+                if t_type == "DEPOSIT":
+                    row = conn.execute(SQL_CREDIT_BAL, (amount_paise, account_no, amount_paise)).fetchone()
+                elif t_type == "WITHDRAW":
+                    row = conn.execute(SQL_DEBIT_BAL, (amount_paise, account_no, amount_paise)).fetchone()
+                else:
+                    raise ValueError(f"Unsupported operation: {t_type}")
+                if row is None:
+                    if not account_exists(conn, account_no):
+                        raise ValueError(f"Account not found: {format_account_no(account_no)}")
+                    if t_type == "DEPOSIT":
+                        raise ValueError(f"Deposit would overflow the balance of {format_account_no(account_no)}.")
+                    raise InsufficientFunds(f"Insufficient balance in {format_account_no(account_no)}.")
+                tx_rows.append((account_no, t_type, amount_paise, row[0], None, note))
+
+            # One statement for the whole ledger
+            _TX_CUR.executemany(SQL_INSERT_TX, tx_rows)
+            conn.execute("COMMIT;")
+            return [r[3] for r in tx_rows]
+        except Exception:
+            conn.execute("ROLLBACK;")
+            raise
 
-from datetime import datetime
+def fetch_transactions(account_no: int, limit: int = 20):
+    with db_conn() as conn:
+        cur = conn.execute(SQL_FETCH_TX, (account_no, limit))
+        return cur.fetchall()
 
-def export_transactions_csv(account_no: str, out_path: str):
-    rows = fetch_transactions(account_no, limit=1000000)
-    headers = ["id", "type", "amount", "balance_after", "counterparty_account", "note", "created_at"]
-
-    with open(out_path, "w", newline="", encoding="utf-8-sig") as f:
-        w = csv.writer(f)
-        w.writerow(headers)
-        for r in rows:
-            created_at = r[6]
-            try:
-                # Try converting to datetime for consistent formatting
-                created_at_dt = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S")
-                created_at = created_at_dt.strftime("%Y-%m-%d %H:%M:%S")
-            except (ValueError, TypeError):
-                # If it's already a string or invalid, just keep it as-is
-                pass
-
-            w.writerow([
-                r[0],
-                r[1],
-                paise_to_rupees(r[2]),
-                paise_to_rupees(r[3]),
-                str(r[4]) if r[4] else "",
-                r[5] or "",
-                created_at
-            ])
+_CSV_SPECIAL = frozenset(',"\r\n')
+
+def _csv_field(s: str | None) -> str:
+    """Quote a free-text field the way csv.writer's QUOTE_MINIMAL would."""
+    if not s:
+        return ""
+    if _CSV_SPECIAL.isdisjoint(s):
+        return s
+    return '"' + s.replace('"', '""') + '"'
+
+def export_transactions_csv(account_no: int, out_path: str):
+    # Columns are fixed, so rows are formatted directly rather than through
+    # csv.writer; only the free-text note can need quoting
+    header = "id,type,amount,balance_after,counterparty_account,note,created_at\r\n"
+
+    with db_conn() as conn, open(out_path, "wb", buffering=1 << 20) as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        # Iterate the cursor directly so rows are written as they are read
+        cur = conn.execute(SQL_EXPORT_TX, (account_no,))
+        write = f.write
+        write(codecs.BOM_UTF8 + header.encode())
+        # Amounts are never negative and created_at is already stored as
+        # '%Y-%m-%d %H:%M:%S' by the schema default
+        for t_id, t_type, amt, bal, cp, note, ts in cur:
+            cp_str = f"{cp:012d}" if cp is not None else ""
+            write(f"{t_id},{t_type},₹{amt // 100}.{amt % 100:02d},₹{bal // 100}.{bal % 100:02d},"
+                  f"{cp_str},{_csv_field(note)},{ts}\r\n".encode())
     return out_path
 
 
@@ -236,8 +436,7 @@ def menu():
 def prompt(msg):
     return input(msg).strip()
 
-def main():
-    init_db()
+def run_cli():
     print_header()
     while True:
         try:
@@ -246,15 +445,15 @@ def main():
             if choice == "1":
                 name = prompt("Enter account holder name: ")
                 acct = create_account(name)
-                print(f"✅ Account created. Account No: {acct}")
+                print(f"✅ Account created. Account No: {format_account_no(acct)}")
             elif choice == "2":
-                acct = prompt("Enter account no: ")
+                acct = parse_account_no(prompt("Enter account no: "))
                 amt = parse_amount_to_paise(prompt("Enter amount (e.g., 100 or 100.50): "))
                 note = prompt("Optional note: ")
                 new_bal = deposit(acct, amt, note or None)
                 print(f"✅ Deposited {paise_to_rupees(amt)}. New Balance: {paise_to_rupees(new_bal)}")
             elif choice == "3":
-                acct = prompt("Enter account no: ")
+                acct = parse_account_no(prompt("Enter account no: "))
                 amt = parse_amount_to_paise(prompt("Enter amount (e.g., 100 or 100.50): "))
                 note = prompt("Optional note: ")
                 try:
@@ -263,19 +462,19 @@ def main():
                 except InsufficientFunds as e:
                     print(f"❌ {e}")
             elif choice == "4":
-                from_acct = prompt("From account no: ")
-                to_acct = prompt("To account no: ")
+                from_acct = parse_account_no(prompt("From account no: "))
+                to_acct = parse_account_no(prompt("To account no: "))
                 amt = parse_amount_to_paise(prompt("Enter amount (e.g., 100 or 100.50): "))
                 note = prompt("Optional note: ")
                 try:
                     new_a, new_b = transfer(from_acct, to_acct, amt, note or None)
-                    print(f"✅ Transferred {paise_to_rupees(amt)} from {from_acct} to {to_acct}.")
+                    print(f"✅ Transferred {paise_to_rupees(amt)} from {format_account_no(from_acct)} to {format_account_no(to_acct)}.")
                     print(f"   New Balance (From): {paise_to_rupees(new_a)}")
                     print(f"   New Balance (To)  : {paise_to_rupees(new_b)}")
                 except InsufficientFunds as e:
                     print(f"❌ {e}")
             elif choice == "5":
-                acct = prompt("Enter account no: ")
+                acct = parse_account_no(prompt("Enter account no: "))
                 limit_raw = prompt("How many recent transactions? (default 20): ").strip()
                 limit = int(limit_raw) if limit_raw.isdigit() else 20
                 rows = fetch_transactions(acct, limit=limit)
@@ -288,13 +487,13 @@ def main():
                         t_id, t_type, amt_p, bal_p, cp, note, ts = r
                         amt = paise_to_rupees(amt_p)
                         bal = paise_to_rupees(bal_p)
-                        cp_str = f" | With: {cp}" if cp else ""
+                        cp_str = f" | With: {format_account_no(cp)}" if cp is not None else ""
                         note_str = f" | Note: {note}" if note else ""
                         print(f"[{t_id}] {ts} | {t_type:<12} | {amt:<10} | Bal: {bal}{cp_str}{note_str}")
                     print("-" * 68)
             elif choice == "6":
-                acct = prompt("Enter account no: ")
-                filename = f"transactions_{acct}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+                acct = parse_account_no(prompt("Enter account no: "))
+                filename = f"transactions_{format_account_no(acct)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
                 out_path = os.path.join(os.path.dirname(__file__), filename)
                 try:
                     export_transactions_csv(acct, out_path)
@@ -309,5 +508,12 @@ def main():
         except Exception as e:
             print(f"❌ Error: {e}")
 
+def main():
+    init_db()
+    try:
+        run_cli()
+    finally:
+        close_db()
+
 if __name__ == "__main__":
     main()